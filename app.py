@@ -3,52 +3,281 @@ Flask Application for Resume Management
 """
 
 import os
+import re
+import hashlib
+import atexit
 import logging
-
+import mimetypes
+import queue
+import threading
+import dataclasses
+from logging.handlers import QueueHandler, QueueListener
+from urllib.parse import quote
+from functools import lru_cache
+from types import MappingProxyType
+
+import orjson
 from spellchecker import SpellChecker
 from flask_cors import CORS
 
-from werkzeug.utils import secure_filename
-from flask import Flask, jsonify, request, send_from_directory
+from werkzeug.security import safe_join
+from flask import Flask, Response, abort, jsonify, request, send_from_directory
 from models import Experience, Education, Skill, UserInformation
 from helpers import (
     validate_fields,
     validate_phone_number,
     load_data,
-    save_data,
+    save_encoded_sections,
     generate_id,
+    file_sha256,
+    save_upload,
+    OrjsonProvider,
+    UploadRequest,
 )
 
 
 spell = SpellChecker()
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Request threads only put log records on a queue; a listener thread writes
+# them out, so slow stderr writes never hold up a request.
+log_handler = QueueHandler(queue.SimpleQueue())
+
+# Process ID of the running log listener, empty until logging is configured
+_log_listener = {}
+
+
+def configure_logging():
+    """
+    Send log records of the app to stderr through a listener thread.
+    Called by the entry points rather than on import, so importing the app
+    leaves the logging setup of the importer alone. Threads do not survive a
+    fork, so forked workers call it again to start their own listener, on a
+    new queue that holds none of the parent's records.
+    """
+    if _log_listener.get("pid") == os.getpid():
+        return
+    root_logger = logging.getLogger()
+    if log_handler not in root_logger.handlers:
+        root_logger.addHandler(log_handler)
+        root_logger.setLevel(logging.INFO)
+    log_handler.queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    listener = QueueListener(log_handler.queue, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    _log_listener["pid"] = os.getpid()
+
+
+# The flask command imports the app instead of running this module, so its
+# commands, `flask run` included, configure logging here
+if os.environ.get("FLASK_RUN_FROM_CLI") == "true":
+    configure_logging()
 
 UPLOAD_FOLDER = "uploads/"
+# Absolute upload folder path with a trailing separator; saved logo names are
+# hex digests plus an extension, so they can be appended to it directly.
+UPLOAD_PREFIX = os.path.join(os.path.abspath(UPLOAD_FOLDER), "")
+# Private spool folder for large uploads while they are received; it is inside
+# the upload folder so keeping an upload stays an atomic rename, and hidden
+# paths are never served from /uploads
+UPLOAD_SPOOL_FOLDER = os.path.join(UPLOAD_FOLDER, ".tmp")
 DEFAULT_LOGO = "default.jpg"
-ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "gif"}
+ALLOWED_EXTENSIONS = frozenset({"png", "jpg", "jpeg", "gif"})
+MAX_CONTENT_LENGTH = 16 * 1024 * 1024
+
+# Mimetypes whose bodies are read as form data instead of JSON
+FORM_MIMETYPES = frozenset({"multipart/form-data", "application/x-www-form-urlencoded"})
+
+# Leading bytes of the image formats accepted as logos
+IMAGE_SIGNATURES = (b"\x89PNG\r\n\x1a\n", b"\xff\xd8\xff", b"GIF87a", b"GIF89a")
+
+# Required fields and their expected types for each resume section
+EXPERIENCE_FIELDS = MappingProxyType(
+    {
+        "title": str,
+        "company": str,
+        "start_date": str,
+        "end_date": str,
+        "description": str,
+    }
+)
+EDUCATION_FIELDS = MappingProxyType(
+    {
+        "course": str,
+        "school": str,
+        "start_date": str,
+        "end_date": str,
+        "grade": str,
+    }
+)
+SKILL_FIELDS = MappingProxyType({"name": str, "proficiency": str})
+USER_INFORMATION_FIELDS = ("name", "email_address", "phone_number")
+
+# Bodies of the static routes, encoded once at import
+HOME_BODY = b"Welcome to MLH 24.FAL.A.2 Orientation API Project!!"
+TEST_BODY = orjson.dumps({"message": "Hello, World!"})
+
+# Fields of each resume section that the spellcheck endpoint checks, in order
+SPELLCHECK_FIELDS = (
+    ("experience", ("title", "description")),
+    ("education", ("course",)),
+    ("skill", ("name",)),
+)
+
+# Words as the spellchecker sees them
+WORD_PATTERN = re.compile(r"[A-Za-z']+")
+
+# Sentinel for fields that are absent from a request body
+_MISSING = object()
+
+# Created at import so servers other than app.run can save uploads right away
+os.makedirs(UPLOAD_SPOOL_FOLDER, exist_ok=True)
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+# Keep responses compact and in field order, also when running with debug=True
+app.json.compact = True
+app.json.sort_keys = False
+app.request_class = UploadRequest
 CORS(app)
 app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
+app.config["UPLOAD_SPOOL_FOLDER"] = UPLOAD_SPOOL_FOLDER
+app.config["MAX_CONTENT_LENGTH"] = MAX_CONTENT_LENGTH
+# Internal nginx location that serves the upload folder, e.g. /internal-uploads/
+app.config["UPLOADS_ACCEL_REDIRECT"] = os.environ.get("UPLOADS_ACCEL_REDIRECT", "")
+
+DATA_FILE = "data/data.json"
+
+# Resume sections, in the order they are saved in data.json
+SECTIONS = ("experience", "education", "skill", "user_information")
+
+# Changes made within this many seconds of each other are saved in one write
+SAVE_DELAY = 0.25
+
+data = load_data(DATA_FILE)
+# Custom sections only live in memory; data.json holds the SECTIONS only
+data["custom_sections"] = []
 
-data = load_data("data/data.json")
+# Serializes changes to data and writes of data.json between request threads
+data_lock = threading.RLock()
+
+# Timer of the pending data.json write, empty when everything is saved
+_pending_save = {}
+
+# Encoded resume sections, rebuilt whenever the section changes; they serve
+# both the GET responses and the data.json writes
+_response_cache = {}
+
+# ETags of the cached section encodings, as (encoding, etag) pairs
+_etag_cache = {}
 
 
 def reset_data():
     """
     Resets the values stored in data to placeholders.
+    Each key and cached encoding is replaced in place rather than cleared,
+    so GET requests served during a reset never find a section missing.
+    """
+    with data_lock:
+        for section in SECTIONS + ("custom_sections",):
+            data[section] = []
+            _response_cache[section] = orjson.dumps(data[section])
+        schedule_save()
+
+
+def flush_data():
+    """
+    Write data.json now if a change is still waiting to be saved.
+    """
+    with data_lock:
+        timer = _pending_save.pop("timer", None)
+        if timer is not None:
+            timer.cancel()
+            save_encoded_sections(
+                DATA_FILE, {section: encoded_section(section) for section in SECTIONS}
+            )
+
+
+def schedule_save():
+    """
+    Save data.json shortly, so a burst of changes is written only once.
+    Pending changes are also written when the process exits.
+    """
+    with data_lock:
+        if "timer" not in _pending_save:
+            timer = _pending_save["timer"] = threading.Timer(SAVE_DELAY, flush_data)
+            timer.daemon = True
+            timer.start()
+
+
+atexit.register(flush_data)
+
+
+def save_section(section):
+    """
+    Persist the data after a section changed and re-encode its cached response,
+    so GET requests never have to serialize the section themselves.
+
+    :param section: The key of the changed section in data
+    """
+    with data_lock:
+        _response_cache[section] = orjson.dumps(data[section])
+        schedule_save()
+
+
+def encoded_section(section):
+    """
+    Get the JSON encoding of a section, encoding it only if it was not
+    encoded since it last changed.
+
+    :param section: The key of the section in data
+    :return: The section entries as JSON bytes
+    """
+    body = _response_cache.get(section)
+    if body is None:
+        # Encode under the lock, so a concurrent change cannot be overwritten
+        # by an encoding of the section from before that change
+        with data_lock:
+            body = _response_cache.get(section)
+            if body is None:
+                body = _response_cache[section] = orjson.dumps(data[section])
+    return body
+
+
+def section_response(section):
+    """
+    Build the JSON response listing a section from its cached encoding.
+    The bytes are passed through to the server untouched, and clients that
+    already hold the same version get an empty 304 response instead.
+
+    :param section: The key of the section in data
+    :return: A JSON response with the section entries
     """
-    data.clear()
-    data["experience"] = []
-    data["education"] = []
-    data["skill"] = []
-    data["user_information"] = []
-    save_data("data/data.json", data)
+    body = encoded_section(section)
+    cached = _etag_cache.get(section)
+    if cached is None or cached[0] is not body:
+        cached = _etag_cache[section] = (
+            body,
+            hashlib.sha1(body, usedforsecurity=False).hexdigest(),
+        )
+    response = Response(body, mimetype="application/json", direct_passthrough=True)
+    response.set_etag(cached[1])
+    return response.make_conditional(request)
+
 
+def allowed_extension(filename):
+    """
+    Get the extension of an uploaded file if it is an allowed one.
 
-# reset_data()
+    :param filename: The name of the file to check
+    :return: The lowercased extension, or None if it is not allowed
+    """
+    dot = filename.rfind(".")
+    if dot < 0:
+        return None
+    extension = filename[dot + 1 :].lower()
+    return extension if extension in ALLOWED_EXTENSIONS else None
 
 
 def allowed_file(filename):
@@ -58,24 +287,177 @@ def allowed_file(filename):
     :param filename: The name of the file to check
     :return: True if the file extension is allowed, False otherwise
     """
-    return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
+    return allowed_extension(filename) is not None
+
+
+def has_image_signature(stream):
+    """
+    Check if an uploaded file starts with the signature of an allowed image type.
+
+    :param stream: The file stream of the upload, left at its start
+    :return: True if the file looks like a PNG, JPEG or GIF image, False otherwise
+    """
+    head = stream.read(8)
+    stream.seek(0)
+    return head.startswith(IMAGE_SIGNATURES)
+
+
+def make_validator(required_fields):
+    """
+    Build a function that checks request bodies for a fixed set of fields.
+    The field names and types are unpacked once here instead of on every request.
+
+    :param required_fields: A mapping of field names to their expected types
+    :return: A function taking a request body and returning a tuple
+        (missing_fields, invalid_fields)
+    """
+    names = frozenset(required_fields)
+    fields = tuple(required_fields.items())
+
+    def validate(request_body):
+        if request_body.keys() >= names:
+            return [], [
+                field
+                for field, field_type in fields
+                if not isinstance(request_body[field], field_type)
+            ]
+
+        missing_fields = []
+        invalid_fields = []
+        for field, field_type in fields:
+            value = request_body.get(field, _MISSING)
+            if value is _MISSING:
+                missing_fields.append(field)
+            elif not isinstance(value, field_type):
+                invalid_fields.append(field)
+        return missing_fields, invalid_fields
+
+    return validate
+
+
+validate_experience = make_validator(EXPERIENCE_FIELDS)
+validate_education = make_validator(EDUCATION_FIELDS)
+validate_skill = make_validator(SKILL_FIELDS)
+
+
+def get_request_body():
+    """
+    Get the body of the current request as form data or JSON.
+
+    :return: The form data of form requests, otherwise the decoded JSON,
+        or None if the body is not a valid JSON object
+    """
+    if request.mimetype in FORM_MIMETYPES:
+        return request.form
+    request_body = request.get_json(silent=True)
+    return request_body if isinstance(request_body, dict) else None
+
+
+@lru_cache(maxsize=64)
+def encoded_error(message):
+    """
+    Encode the body of an error response once per distinct message.
 
+    :param message: The error message
+    :return: The JSON error body as bytes
+    """
+    return orjson.dumps({"error": message})
+
+
+def error_response(message, status):
+    """
+    Build a JSON error response without encoding the same message again.
 
-def handle_missing_invalid_fields(request_body, required_fields):
+    :param message: The error message
+    :param status: The HTTP status code
+    :return: The error response
     """
-    Check for missing and invalid fields in the request body.
+    return Response(encoded_error(message), status=status, mimetype="application/json")
+
+
+def validate_request_body(request_body, validator):
+    """
+    Validate the request body with a validator built by make_validator.
 
     :param request_body: The body of the request (either JSON or form data)
-    :param required_fields: A dictionary of field names and their expected types
-    :return: A tuple (missing_fields, invalid_fields)
-    """
-    missing_fields = [field for field in required_fields if field not in request_body]
-    invalid_fields = [
-        field
-        for field, field_type in required_fields.items()
-        if field in request_body and not isinstance(request_body[field], field_type)
-    ]
-    return missing_fields, invalid_fields
+    :param validator: The validator for the required fields of the section
+    :return: An error response tuple if validation failed, None otherwise
+    """
+    missing_fields, invalid_fields = validator(request_body)
+    if missing_fields or invalid_fields:
+        return (
+            jsonify(
+                {
+                    "error": "Validation failed",
+                    "missing_fields": missing_fields,
+                    "invalid_fields": invalid_fields,
+                }
+            ),
+            400,
+        )
+    return None
+
+
+def save_logo(default=DEFAULT_LOGO):
+    """
+    Save the logo uploaded with the current request if it is an allowed image.
+    Logos are stored under the SHA-256 digest of their content, so a logo with
+    the same content as one saved before reuses that file.
+
+    :param default: The logo filename to use when no allowed logo was uploaded
+    :return: The filename of the saved logo, or the default
+    """
+    if request.mimetype != "multipart/form-data":
+        return default
+
+    logo_file = request.files.get("logo")
+    extension = logo_file and allowed_extension(logo_file.filename)
+    if extension and has_image_signature(logo_file.stream):
+        filename = f"{file_sha256(logo_file.stream).hex()}.{extension}"
+        if not os.path.exists(UPLOAD_PREFIX + filename):
+            save_upload(logo_file, UPLOAD_PREFIX + filename)
+        return filename
+    return default
+
+
+def make_add_view(section, model, validator):
+    """
+    Build the POST view that adds an entry to a resume section.
+    The body may be JSON or form data with an optional logo upload.
+
+    :param section: The key of the section in data
+    :param model: The model class of the section entries
+    :param validator: The validator for the required fields of the section
+    :return: The view function
+    """
+    model_fields = tuple(field.name for field in dataclasses.fields(model))
+    field_names = tuple(name for name in model_fields if name not in ("logo", "id"))
+    has_id = "id" in model_fields
+
+    def add_entry():
+        request_body = get_request_body()
+        if not request_body:
+            return error_response("Request must be JSON or include form data", 400)
+
+        validation_error = validate_request_body(request_body, validator)
+        if validation_error:
+            return validation_error
+
+        fields = {name: request_body[name] for name in field_names}
+        fields["logo"] = save_logo()
+        with data_lock:
+            if has_id:
+                fields["id"] = generate_id(data, section)
+            entries = data[section]
+            entries.append(model(**fields))
+            new_index = len(entries) - 1
+            save_section(section)
+        return (
+            jsonify({"message": f"New {section} created", "id": new_index}),
+            201,
+        )
+
+    return add_entry
 
 
 @app.route("/", strict_slashes=False)
@@ -83,7 +465,7 @@ def home():
     """
     Returns a welcome message for the app
     """
-    return "Welcome to MLH 24.FAL.A.2 Orientation API Project!!"
+    return Response(HOME_BODY, mimetype="text/html")
 
 
 @app.route("/test")
@@ -91,7 +473,7 @@ def hello_world():
     """
     Returns a JSON test message
     """
-    return jsonify({"message": "Hello, World!"})
+    return Response(TEST_BODY, mimetype="application/json")
 
 @app.route("/reset", methods=["POST"])
 def reset():
@@ -101,74 +483,20 @@ def reset():
     reset_data()
     return jsonify({"message": "Data has been reset"}), 200
 
-@app.route("/resume/experience", methods=["GET", "POST"])
-def experience():
+@app.route("/resume/experience", methods=["GET"])
+def get_experience():
     """
-    Handle experience requests for GET and POST methods
+    List all experience entries
     """
-    if request.method == "GET":
-        return jsonify([exp.__dict__ for exp in data["experience"]]), 200
-
-    if request.method == "POST":
-        request_body = request.form
-
-        if not request_body:
-            return jsonify({"error": "Request must include form data"}), 400
-
-        required_fields = {
-            "title": str,
-            "company": str,
-            "start_date": str,
-            "end_date": str,
-            "description": str,
-        }
-        missing_fields, invalid_fields = handle_missing_invalid_fields(
-            request_body, required_fields
-        )
+    return section_response("experience")
 
-        if missing_fields or invalid_fields:
-            return (
-                jsonify(
-                    {
-                        "error": "Validation failed",
-                        "missing_fields": missing_fields,
-                        "invalid_fields": invalid_fields,
-                    }
-                ),
-                400,
-            )
-
-        # Handle logo file
-        logo_filename = DEFAULT_LOGO
-        if "logo" in request.files:
-            logo_file = request.files["logo"]
-            if logo_file and allowed_file(logo_file.filename):
-                filename = secure_filename(logo_file.filename)
-                logo_file.save(os.path.join(app.config["UPLOAD_FOLDER"], filename))
-                logo_filename = filename
-
-        # Create new experience
-        new_id = generate_id(data, "experience")
-
-        # Create new experience
-        new_experience = Experience(
-            request_body["title"],
-            request_body["company"],
-            request_body["start_date"],
-            request_body["end_date"],
-            request_body["description"],
-            logo_filename,
-            new_id,
-        )
-        data["experience"].append(new_experience)
-        save_data("data/data.json", data)
-        new_experience_index = new_id - 1
-        return (
-            jsonify({"message": "New experience created", "id": new_experience_index}),
-            201,
-        )
 
-    return 400
+app.add_url_rule(
+    "/resume/experience",
+    "add_experience",
+    make_add_view("experience", Experience, validate_experience),
+    methods=["POST"],
+)
 
 
 @app.route("/resume/experience/<int:index>", methods=["DELETE"])
@@ -176,94 +504,55 @@ def delete_experience(index):
     """
     Delete experience entry by index
     """
-    if 0 <= index < len(data["experience"]):
-        data["experience"].pop(index)
-        save_data("data/data.json", data)
-        return jsonify({"message": "Experience entry successfully deleted"}), 200
-    return jsonify({"error": "Experience entry not found"}), 404
+    with data_lock:
+        entries = data["experience"]
+        if index < len(entries):
+            entries.pop(index)
+            save_section("experience")
+            return jsonify({"message": "Experience entry successfully deleted"}), 200
+    return error_response("Experience entry not found", 404)
 
 
-@app.route("/resume/education", methods=["GET", "POST"])
-def education():
+@app.route("/resume/education", methods=["GET"])
+def get_education():
     """
-    Handle education requests for GET and POST methods.
-    POST: Add a new education entry with optional file upload.
+    List all education entries
     """
-    if request.method == "GET":
-        return jsonify([edu.__dict__ for edu in data["education"]]), 200
-
-    if request.method == "POST":
-        if request.content_type.startswith('multipart/form-data'):
-            request_body = request.form
-        else:
-            request_body = request.get_json()
-
-        if not request_body:
-            return jsonify({"error": "Request must be JSON or include form data"}), 400
-
-        required_fields = {
-            "course": str,
-            "school": str,
-            "start_date": str,
-            "end_date": str,
-            "grade": str,
-        }
-        missing_fields, invalid_fields = handle_missing_invalid_fields(
-            request_body, required_fields
-        )
+    return section_response("education")
 
-        if missing_fields or invalid_fields:
-            return jsonify({
-                "error": "Validation failed",
-                "missing_fields": missing_fields,
-                "invalid_fields": invalid_fields
-            }), 400
-
-        logo_filename = DEFAULT_LOGO
-        if "logo" in request.files:
-            logo_file = request.files["logo"]
-            if logo_file and allowed_file(logo_file.filename):
-                filename = secure_filename(logo_file.filename)
-                logo_file.save(os.path.join(app.config["UPLOAD_FOLDER"], filename))
-                logo_filename = filename
-
-        new_id = generate_id(data, 'education')
-
-        new_education = Education(
-            request_body["course"],
-            request_body["school"],
-            request_body["start_date"],
-            request_body["end_date"],
-            request_body["grade"],
-            logo_filename,
-            new_id
-        )
-        data["education"].append(new_education)
-        save_data('data/data.json', data)
-        new_education_index = len(data["education"]) - 1
-        return jsonify({"message": "New education created", "id": new_education_index}), 201
 
-    return 400
+app.add_url_rule(
+    "/resume/education",
+    "add_education",
+    make_add_view("education", Education, validate_education),
+    methods=["POST"],
+)
 
 
 @app.route("/resume/experience/<int:index>", methods=["GET"])
 def experience_by_index(index):
     """
-    Retrieve experience by index
+    Retrieve experience by index.
+    The int converter only matches non-negative numbers, so indexing the list
+    directly is the whole bounds check.
     """
-    if 0 <= index < len(data["experience"]):
-        return jsonify(data["experience"][index].__dict__), 200
-    return jsonify({"error": "Experience not found"}), 404
+    try:
+        return jsonify(data["experience"][index]), 200
+    except IndexError:
+        return error_response("Experience not found", 404)
 
 
 @app.route("/resume/education/<int:index>", methods=["GET"])
 def education_by_index(index):
     """
-    Retrieve education by index
+    Retrieve education by index.
+    The int converter only matches non-negative numbers, so indexing the list
+    directly is the whole bounds check.
     """
-    if 0 <= index < len(data["education"]):
-        return jsonify(data["education"][index].__dict__), 200
-    return jsonify({"error": "Education not found"}), 404
+    try:
+        return jsonify(data["education"][index]), 200
+    except IndexError:
+        return error_response("Education not found", 404)
 
 
 @app.route("/resume/education/<int:index>", methods=["DELETE"])
@@ -271,11 +560,13 @@ def delete_education(index):
     """
     Delete education entry by index
     """
-    if 0 <= index < len(data["education"]):
-        data["education"].pop(index)
-        save_data("data/data.json", data)
-        return jsonify({"message": "Education entry successfully deleted"}), 200
-    return jsonify({"error": "Education entry not found"}), 404
+    with data_lock:
+        entries = data["education"]
+        if index < len(entries):
+            entries.pop(index)
+            save_section("education")
+            return jsonify({"message": "Education entry successfully deleted"}), 200
+    return error_response("Education entry not found", 404)
 
 
 @app.route("/resume/education/<int:index>", methods=["PUT"])
@@ -284,125 +575,87 @@ def update_education(index):
     Update education entry by index.
     Supports updating both text fields and file upload for logo.
     """
-    if 0 <= index < len(data["education"]):
-        if request.content_type.startswith('multipart/form-data'):
-            request_body = request.form
-        else:
-            request_body = request.get_json()
-
-        if not request_body:
-            return jsonify({"error": "Request must be JSON or include form data"}), 400
+    if index >= len(data["education"]):
+        return error_response("Education entry not found", 404)
 
-        edu = data["education"][index]
+    # Read the body and save the logo before locking, so a slow upload does
+    # not hold up other changes
+    request_body = get_request_body()
+    if not request_body:
+        return error_response("Request must be JSON or include form data", 400)
+    logo = save_logo(None)
 
-        edu.course = request_body.get("course", edu.course)
-        edu.school = request_body.get("school", edu.school)
-        edu.start_date = request_body.get("start_date", edu.start_date)
-        edu.end_date = request_body.get("end_date", edu.end_date)
-        edu.grade = request_body.get("grade", edu.grade)
+    with data_lock:
+        entries = data["education"]
+        if index < len(entries):
+            edu = entries[index]
 
-        if "logo" in request.files:
-            logo_file = request.files["logo"]
-            if logo_file and allowed_file(logo_file.filename):
-                filename = secure_filename(logo_file.filename)
-                logo_file.save(os.path.join(app.config["UPLOAD_FOLDER"], filename))
-                edu.logo = filename
+            edu.course = request_body.get("course", edu.course)
+            edu.school = request_body.get("school", edu.school)
+            edu.start_date = request_body.get("start_date", edu.start_date)
+            edu.end_date = request_body.get("end_date", edu.end_date)
+            edu.grade = request_body.get("grade", edu.grade)
+            if logo is not None:
+                edu.logo = logo
 
-        save_data('data/data.json', data)
-        return jsonify({"message": "Education entry updated", "id": index}), 200
+            save_section("education")
+            return jsonify({"message": "Education entry updated", "id": index}), 200
 
-    return jsonify({"error": "Education entry not found"}), 404
+    return error_response("Education entry not found", 404)
 
 
-@app.route("/resume/skill", methods=["GET", "POST"])
-def skill():
+@app.route("/resume/skill", methods=["GET"])
+def get_skill():
     """
-    Handle skill requests
+    List all skills
     """
-    if request.method == "GET":
-        return jsonify([sk.__dict__ for sk in data["skill"]]), 200
+    return section_response("skill")
 
-    if request.method == "POST":
-        request_body = (
-            request.form
-            if request.content_type == "multipart/form-data"
-            else request.get_json()
-        )
-        if not request_body:
-            return jsonify({"error": "Request must be JSON or include form data"}), 400
 
-        required_fields = {"name": str, "proficiency": str}
-        missing_fields, invalid_fields = handle_missing_invalid_fields(
-            request_body, required_fields
-        )
-
-        if missing_fields or invalid_fields:
-            return (
-                jsonify(
-                    {
-                        "error": "Validation failed",
-                        "missing_fields": missing_fields,
-                        "invalid_fields": invalid_fields,
-                    }
-                ),
-                400,
-            )
+app.add_url_rule(
+    "/resume/skill",
+    "add_skill",
+    make_add_view("skill", Skill, validate_skill),
+    methods=["POST"],
+)
 
-        # Handle logo file
-        logo_filename = DEFAULT_LOGO
-        if "logo" in request.files:
-            logo_file = request.files["logo"]
-            if logo_file and allowed_file(logo_file.filename):
-                filename = secure_filename(logo_file.filename)
-                logo_file.save(os.path.join(app.config["UPLOAD_FOLDER"], filename))
-                logo_filename = filename
-
-        # Create new skill
-        new_skill = Skill(
-            request_body["name"], request_body["proficiency"], logo_filename
-        )
-        data["skill"].append(new_skill)
 
-        save_data("data/data.json", data)
-        return (
-            jsonify({"message": "New skill created", "id": len(data["skill"]) - 1}),
-            201,
-        )
-
-    return 400
+@app.route("/resume/user_information", methods=["GET"])
+def get_user_information():
+    """
+    Get the user information
+    """
+    return section_response("user_information")
 
 
-@app.route("/resume/user_information", methods=["GET", "POST", "PUT"])
-def user_information():
+@app.route("/resume/user_information", methods=["POST", "PUT"])
+def set_user_information():
     """
-    Handle user information requests
+    Create or replace the user information
     """
-    if request.method == "GET":
-        return jsonify([user.__dict__ for user in data["user_information"]]), 200
+    request_body = request.get_json(silent=True)
+    if not isinstance(request_body, dict):
+        request_body = {}
 
-    request_body = request.get_json()
-
-    error = validate_fields(["name", "email_address", "phone_number"], request_body)
+    error = validate_fields(USER_INFORMATION_FIELDS, request_body)
     if error:
-        return jsonify({"error": f"{', '.join(error)} parameter(s) is required"}), 400
+        return error_response(f"{', '.join(error)} parameter(s) is required", 400)
 
     is_valid_phone_number = validate_phone_number(request_body["phone_number"])
     if not is_valid_phone_number:
-        return jsonify({"error": "Invalid phone number"}), 400
+        return error_response("Invalid phone number", 400)
 
-    if request.method in ("POST", "PUT"):
-        new_user_information = UserInformation(
-            name=request_body["name"],
-            email_address=request_body["email_address"],
-            phone_number=request_body["phone_number"]
-        )
+    new_user_information = UserInformation(
+        name=request_body["name"],
+        email_address=request_body["email_address"],
+        phone_number=request_body["phone_number"]
+    )
 
+    with data_lock:
         data["user_information"] = [new_user_information]
-        save_data("data/data.json", data)
-
-        return jsonify(new_user_information.__dict__), 201
+        save_section("user_information")
 
-    return 400
+    return jsonify(new_user_information), 201
 
 
 @app.route("/resume/skill/<int:index>", methods=["DELETE"])
@@ -410,75 +663,86 @@ def delete_skill(index):
     """
     Delete skill by index
     """
-    if 0 <= index < len(data["skill"]):
-        removed_skill = data["skill"].pop(index)
-        logging.info("Skill deleted: %s", removed_skill.name)
-        save_data("data/data.json", data)
-        return jsonify({"message": "Skill successfully deleted"}), 200
-    return jsonify({"error": "Skill not found"}), 404
+    with data_lock:
+        entries = data["skill"]
+        if index < len(entries):
+            removed_skill = entries.pop(index)
+            logging.info("Skill deleted: %s", removed_skill.name)
+            save_section("skill")
+            return jsonify({"message": "Skill successfully deleted"}), 200
+    return error_response("Skill not found", 404)
 
 
-@app.route("/resume/spellcheck", methods=["POST"])
-def spellcheck():
+@lru_cache(maxsize=4096)
+def spelling_correction(word):
     """
-    Spellcheck the resume.
-    (TODO add more detailed info here)
+    Memoized spell.correction, since resumes repeat the same words.
+
+    :param word: A lowercased word that is not in the dictionary
+    :return: The most likely correction, or None if there is none
     """
-    request_body = request.get_json()
-    if not request_body:
-        return jsonify({"error": "Request must be JSON"}), 400
+    return spell.correction(word)
 
-    results = []
 
-    for exp in request_body.get("experience", []):
-        title = exp.get("title", "")
-        description = exp.get("description", "")
-        if title:
-            results.append(
-                {
-                    "before": title,
-                    "after": (
-                        list(spell.candidates(title)) if spell.candidates(title) else []
-                    ),
-                }
-            )
-        if description:
-            results.append(
-                {
-                    "before": description,
-                    "after": (
-                        list(spell.candidates(description))
-                        if spell.candidates(description)
-                        else []
-                    ),
-                }
-            )
+def correct_spelling(text, unknown):
+    """
+    Correct the misspelled words of a text one word at a time.
+    The spellchecker only understands single words, and most words are
+    known, so only the unknown ones go through the correction search.
 
-    for edu in request_body.get("education", []):
-        course = edu.get("course", "")
-        if course:
-            results.append(
-                {
-                    "before": course,
-                    "after": (
-                        list(spell.candidates(course))
-                        if spell.candidates(course)
-                        else []
-                    ),
-                }
-            )
+    :param text: The text to correct
+    :param unknown: The lowercased words of the text missing from the dictionary
+    :return: The corrected text, or None if nothing was corrected
+    """
+    if unknown.isdisjoint(word.lower() for word in WORD_PATTERN.findall(text)):
+        return None
 
-    for sk in request_body.get("skill", []):
-        name = sk.get("name", "")
-        if name:
-            results.append(
-                {
-                    "before": name,
-                    "after": (
-                        list(spell.candidates(name)) if spell.candidates(name) else []
-                    ),
-                }
-            )
+    def replace(match):
+        word = match.group()
+        lowered = word.lower()
+        # Acronyms and mixed-case names such as NASA or iOS are kept as written
+        if word not in (lowered, lowered.capitalize()):
+            return word
+        correction = lowered in unknown and spelling_correction(lowered)
+        if not correction:
+            return word
+        return correction.capitalize() if word[0].isupper() else correction
+
+    corrected = WORD_PATTERN.sub(replace, text)
+    return corrected if corrected != text else None
+
+
+@app.route("/resume/spellcheck", methods=["POST"])
+def spellcheck():
+    """
+    Spellcheck the resume.
+    Checks the experience titles and descriptions, education courses and skill
+    names in the request body, one word at a time. Each non-empty field gets
+    one result, in request order: "before" is the field as sent and "after"
+    holds the field with its misspelled words corrected, or is empty when no
+    word needed a correction.
+    """
+    request_body = request.get_json(silent=True)
+    if not request_body or not isinstance(request_body, dict):
+        return error_response("Request must be JSON", 400)
+
+    # Entries and fields of the wrong type are skipped rather than rejected
+    texts = [
+        text
+        for section, fields in SPELLCHECK_FIELDS
+        if isinstance(request_body.get(section), list)
+        for entry in request_body[section]
+        if isinstance(entry, dict)
+        for text in (entry.get(field) for field in fields)
+        if text and isinstance(text, str)
+    ]
+    # Look every distinct word of the request up in the dictionary at once
+    unknown = spell.unknown({word for text in texts for word in WORD_PATTERN.findall(text)})
+
+    results = []
+    for text in texts:
+        corrected = correct_spelling(text, unknown)
+        results.append({"before": text, "after": [corrected] if corrected else []})
 
     return jsonify(results), 200
 
@@ -489,20 +753,22 @@ def add_custom_section():
     Add a new custom section to the resume.
     Requires a title and content in the request body.
     """
-    request_data = request.get_json()
-    if not request_data:
-        return jsonify({"error": "Request must be JSON"}), 400
+    request_data = request.get_json(silent=True)
+    if not request_data or not isinstance(request_data, dict):
+        return error_response("Request must be JSON", 400)
 
     title = request_data.get("title")
     content = request_data.get("content")
 
     if not title or not content:
-        return jsonify({"error": "Both 'title' and 'content' are required"}), 400
+        return error_response("Both 'title' and 'content' are required", 400)
 
     new_section = {"title": title, "content": content}
-    data["custom_sections"].append(new_section)
-
-    section_id = len(data["custom_sections"]) - 1
+    with data_lock:
+        entries = data["custom_sections"]
+        entries.append(new_section)
+        section_id = len(entries) - 1
+        save_section("custom_sections")
     logging.info("New custom section added: %s", title)
     return jsonify({"message": "Custom section added", "id": section_id}), 201
 
@@ -512,26 +778,43 @@ def get_custom_sections():
     """
     Retrieve all custom sections added by the user.
     """
-    return jsonify(data["custom_sections"]), 200
-
-
-if __name__ == "__main__":
-    if not os.path.exists(UPLOAD_FOLDER):
-        os.makedirs(UPLOAD_FOLDER)
-    app.run(debug=True)
+    return section_response("custom_sections")
 
 
 @app.route("/uploads/<path:filename>")
 def uploaded_file(filename):
     """
     Function for serving uploaded files from /uploads.
+    Behind nginx with UPLOADS_ACCEL_REDIRECT set, the file is only checked
+    here and nginx sends it from disk itself.
+    Hidden paths, such as the spool folder of uploads in progress, are not served.
     """
-    return send_from_directory(app.config["UPLOAD_FOLDER"], filename)
+    if any(part.startswith(".") for part in filename.split("/")):
+        abort(404)
+
+    accel_redirect = app.config["UPLOADS_ACCEL_REDIRECT"]
+    if not accel_redirect:
+        return send_from_directory(app.config["UPLOAD_FOLDER"], filename)
+
+    path = safe_join(UPLOAD_PREFIX, filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    response = Response(mimetype=mimetype)
+    response.headers["X-Accel-Redirect"] = accel_redirect + quote(filename)
+    return response
+
 
 @app.route("/resume/data", methods=["GET"])
 def get_data():
     """
     Get all data from the data.json file
     """
-    final_data = load_data("data/data.json")
+    flush_data()
+    final_data = load_data(DATA_FILE)
     return jsonify(final_data), 200
+
+
+if __name__ == "__main__":
+    configure_logging()
+    app.run(debug=True)
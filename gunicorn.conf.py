@@ -0,0 +1,29 @@
+"""
+Gunicorn settings, picked up automatically by `gunicorn wsgi:app`
+"""
+
+# pylint: disable=invalid-name
+
+import os
+
+# One worker process by default, since every worker holds its own copy of the
+# resume data; read-mostly deployments can raise it with WEB_CONCURRENCY
+workers = int(os.environ.get("WEB_CONCURRENCY", "1"))
+worker_class = "gthread"
+threads = 8
+keepalive = 30
+
+# Import the app, and with it the spellchecker dictionary, before forking,
+# so extra workers share those pages copy-on-write instead of loading them
+preload_app = True
+
+
+def post_fork(server, worker):  # pylint: disable=unused-argument
+    """
+    Start the log listener of a new worker, since the listener thread of the
+    preloaded app is not copied into forked processes
+    """
+    # pylint: disable=import-outside-toplevel
+    from app import configure_logging
+
+    configure_logging()
@@ -2,35 +2,211 @@
 Helper functions for the Flask application
 """
 
+import io
+import os
 import json
+import hashlib
+import shutil
+import tempfile
+from functools import lru_cache
+
+import orjson
 import phonenumbers
+from flask import Request, current_app
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.formparser import FormDataParser, MultiPartParser
 from models import Experience, Education, Skill, UserInformation
 
 
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider that uses orjson for encoding and decoding.
+    Models are dataclasses, so they can be passed to jsonify directly.
+    """
+
+    def _encode(self, obj, sort_keys, indent):
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj, **kwargs):
+        return self._encode(
+            obj, kwargs.get("sort_keys", self.sort_keys), kwargs.get("indent")
+        ).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """
+        Build the jsonify response from orjson's bytes directly, without
+        decoding them to a string first.
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(
+            self._encode(obj, self.sort_keys, indent), mimetype=self.mimetype
+        )
+
+
+# Read size for multipart bodies; Werkzeug's 64 KiB default rescans the
+# buffer for the boundary many times on multi-megabyte uploads.
+MULTIPART_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Requests up to this size keep their uploaded files in memory
+UPLOAD_SPOOL_SIZE = 1024 * 1024
+
+
+class UploadFormDataParser(FormDataParser):
+    """
+    Form data parser that reads multipart bodies in larger chunks
+    """
+
+    def _parse_multipart(self, stream, mimetype, content_length, options):
+        parser = MultiPartParser(
+            stream_factory=self.stream_factory,
+            max_form_memory_size=self.max_form_memory_size,
+            max_form_parts=self.max_form_parts,
+            cls=self.cls,
+            buffer_size=MULTIPART_BUFFER_SIZE,
+        )
+        boundary = options.get("boundary", "").encode("ascii")
+
+        if not boundary:
+            raise ValueError("Missing boundary")
+
+        form, files = parser.parse(stream, boundary, content_length)
+        return stream, form, files
+
+
+class UploadRequest(Request):
+    """
+    Request that keeps small uploads in memory and streams larger ones straight
+    into a temporary file in the upload spool folder, so keeping them is a rename
+    instead of another copy. Temporary files that were not kept are removed
+    when the request closes.
+    """
+
+    form_data_parser_class = UploadFormDataParser
+
+    def _get_file_stream(
+        self, total_content_length, content_type, filename=None, content_length=None
+    ):
+        if total_content_length is not None and total_content_length <= UPLOAD_SPOOL_SIZE:
+            return io.BytesIO()
+        return tempfile.NamedTemporaryFile(
+            "wb+",
+            dir=current_app.config["UPLOAD_SPOOL_FOLDER"],
+            prefix=".upload-",
+            delete=False,
+        )
+
+    def close(self):
+        files = self.__dict__.get("files")
+        names = [
+            getattr(storage.stream, "name", None)
+            for storages in (files.listvalues() if files else ())
+            for storage in storages
+        ]
+        super().close()
+        for name in filter(None, names):
+            try:
+                os.remove(name)
+            except FileNotFoundError:
+                pass
+
+
+def save_upload(file_storage, destination):
+    """
+    Save an uploaded file to the destination path, moving the streamed
+    temporary file into place when there is one. Uploads kept in memory are
+    copied whole into a temporary file in the spool folder first, so the
+    destination never holds a partly written file.
+    """
+    name = getattr(file_storage.stream, "name", None)
+    if isinstance(name, str):
+        file_storage.stream.close()
+    else:
+        temporary_file = tempfile.NamedTemporaryFile(  # pylint: disable=consider-using-with
+            "wb",
+            dir=current_app.config["UPLOAD_SPOOL_FOLDER"],
+            prefix=".upload-",
+            delete=False,
+        )
+        name = temporary_file.name
+        try:
+            with temporary_file:
+                shutil.copyfileobj(
+                    file_storage.stream, temporary_file, length=UPLOAD_SPOOL_SIZE
+                )
+        except BaseException:
+            os.remove(name)
+            raise
+    os.replace(name, destination)
+    os.chmod(destination, 0o644)
+
+
+def file_sha256(stream):
+    """
+    Compute the SHA-256 digest of a file stream and rewind it afterwards
+    """
+    if hasattr(hashlib, "file_digest"):
+        digest = hashlib.file_digest(stream, "sha256").digest()
+    else:
+        sha256 = hashlib.sha256()
+        for chunk in iter(lambda: stream.read(1024 * 1024), b""):
+            sha256.update(chunk)
+        digest = sha256.digest()
+    stream.seek(0)
+    return digest
+
+
+# Values that count as a missing field; a missing key reads as None
+EMPTY_VALUES = (None, "", "null")
+
+
 def validate_fields(field_names, request_data):
     """
     Checks that the required fields are in the request data
     """
     return [
-        field
-        for field in field_names
-        if field not in request_data or request_data[field] in [None, "", "null"]
+        field for field in field_names if request_data.get(field) in EMPTY_VALUES
     ]
 
 
-def validate_phone_number(phone_number):
+# phonenumbers rejects longer input itself; checking it first keeps such
+# strings out of the validation cache
+PHONE_NUMBER_MAX_LENGTH = 250
+
+
+@lru_cache(maxsize=256)
+def is_valid_international_number(phone_number):
     """
-    Checks that the phone number is valid and properly internationalized
+    Parse and validate an international phone number. Memoized, since the
+    same user information is usually sent again on every update.
     """
     try:
-        if phone_number and phone_number.startswith("+"):
-            parsed_number = phonenumbers.parse(phone_number, None)
-            return phonenumbers.is_valid_number(parsed_number)
-        return False
+        return phonenumbers.is_valid_number(phonenumbers.parse(phone_number, None))
     except phonenumbers.phonenumberutil.NumberParseException:
         return False
 
 
+def validate_phone_number(phone_number):
+    """
+    Checks that the phone number is valid and properly internationalized
+    """
+    if (
+        isinstance(phone_number, str)
+        and phone_number.startswith("+")
+        and len(phone_number) <= PHONE_NUMBER_MAX_LENGTH
+    ):
+        return is_valid_international_number(phone_number)
+    return False
+
+
 def load_data(filename):
     """
     Using dataclasses to serialize and deserialize JSON data.
@@ -53,27 +229,23 @@ def load_data(filename):
         print("Error decoding JSON.")
         return {"experience": [], "education": [], "skill": [], "user_information": []}
 
-def save_data(filename, data):
+def save_encoded_sections(filename, sections):
     """
-    This function writes the data to a JSON file. 
-    First it converts the data to a dictionary, then writes it to the file.
+    Write sections that are already encoded as JSON to a JSON file, one
+    section per line, without encoding any of the data again.
     """
+    json_data = b"{\n" + b",\n".join(
+        orjson.dumps(name) + b": " + encoded for name, encoded in sections.items()
+    ) + b"\n}\n"
     try:
-        with open(filename, 'w', encoding="utf-8") as file:
-            json_data = {
-                "experience": [exp.__dict__ for exp in data['experience']],
-                "education": [edu.__dict__ for edu in data['education']],
-                "skill": [skl.__dict__ for skl in data['skill']],
-                "user_information": [info.__dict__ for info in data['user_information']]
-            }
-            json.dump(json_data, file, indent=4)
+        with open(filename, 'wb') as file:
+            file.write(json_data)
     except IOError as e:
         print(f"An error occurred while writing to {filename}: {e}")
 
 def generate_id(data, model):
     """
-    Generate a new ID for a model
+    Generate a new ID for a model.
+    Entries without an ID are skipped; an empty section starts at 1.
     """
-    if data[model]:
-        return max(item.id for item in data[model] if item.id is not None) + 1
-    return 1
+    return max((item.id for item in data[model] if item.id is not None), default=0) + 1
@@ -7,7 +7,7 @@ Models for the Resume API. Each class is related to
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Experience:
     """
     Experience Class
@@ -22,7 +22,7 @@ class Experience:
     id: int = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Education:
     """
     Education Class
@@ -37,7 +37,7 @@ class Education:
     id: int = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Skill:
     """
     Skill Class
@@ -48,7 +48,7 @@ class Skill:
     logo: str
 
 
-@dataclass
+@dataclass(slots=True)
 class UserInformation:
     """
     UserInformation Class
@@ -2,10 +2,31 @@
 Tests in Pytest
 """
 
-import json, io
+import json, io, os, hashlib, logging, shutil
+from dataclasses import asdict
 import pytest
-from app import app, data
-from helpers import validate_fields, validate_phone_number, load_data, save_data
+from app import (
+    _response_cache,
+    log_handler,
+    app,
+    data,
+    allowed_file,
+    allowed_extension,
+    flush_data,
+    has_image_signature,
+    validate_experience,
+    validate_skill,
+)
+from helpers import (
+    validate_fields,
+    validate_phone_number,
+    load_data,
+    save_encoded_sections,
+    save_upload,
+    generate_id,
+    file_sha256,
+)
+from werkzeug.datastructures import FileStorage
 from models import Experience, Education, Skill, UserInformation
 
 
@@ -46,15 +67,15 @@ def reset_data():
     }
 
 def test_get_all_data(client):
+    response = client.get("/resume/data")
     data = load_data("data/data.json")
     expected_data = {
-        "experience": [exp.__dict__ for exp in data["experience"]],
-        "education": [edu.__dict__ for edu in data["education"]],
-        "skill": [sk.__dict__ for sk in data["skill"]],
-        "user_information": [inf.__dict__ for inf in data["user_information"]],
+        "experience": [asdict(exp) for exp in data["experience"]],
+        "education": [asdict(edu) for edu in data["education"]],
+        "skill": [asdict(sk) for sk in data["skill"]],
+        "user_information": [asdict(inf) for inf in data["user_information"]],
     }
 
-    response = client.get("/resume/data")
     assert response.status_code == 200
     assert response.json == expected_data
     
@@ -86,6 +107,30 @@ def test_experience(client):
     assert any(exp["id"] == item_id for exp in response.json)
 
 
+def test_experience_id_is_list_index(client):
+    """The id returned for a new experience indexes it in the list."""
+    example_experience = {
+        "title": "Backend Engineer",
+        "company": "Index Inc",
+        "start_date": "January 2023",
+        "end_date": "Present",
+        "description": "Building APIs",
+    }
+    item_id = client.post("/resume/experience", json=example_experience).json["id"]
+    response = client.get(f"/resume/experience/{item_id}")
+    assert response.status_code == 200
+    assert response.json["company"] == "Index Inc"
+
+
+def test_experience_by_index_not_found(client):
+    """Indices past the end or negative ones are not found."""
+    count = len(client.get("/resume/experience").json)
+    response = client.get(f"/resume/experience/{count}")
+    assert response.status_code == 404
+    assert response.json["error"] == "Experience not found"
+    assert client.get("/resume/experience/-1").status_code == 404
+
+
 def test_delete_experience(client):
     """Test the experience deletion endpoint."""
     get_response = client.get("/resume/experience")
@@ -178,6 +223,65 @@ def test_post_education_with_file_upload(client):
     assert "id" in response.json
 
 
+def test_upload_leaves_no_temporary_files(client):
+    """Uploads that are rejected or saved do not leave temporary files behind."""
+    data = {
+        "course": "Computer Science",
+        "school": "University of Awesome",
+        "start_date": "2020",
+        "end_date": "2024",
+        "grade": "A",
+        "logo": (io.BytesIO(b"not an image"), "notes.txt"),
+    }
+    response = client.post(
+        "/resume/education", data=data, content_type="multipart/form-data"
+    )
+    assert response.status_code == 201
+    assert not os.listdir(os.path.join("uploads", ".tmp"))
+
+
+def test_large_upload_spools_outside_served_files(client):
+    """Large uploads are spooled in a private folder that /uploads does not serve."""
+    logo = b"GIF89a" + b"\0" * (2 * 1024 * 1024)
+    saved_name = hashlib.sha256(logo).hexdigest() + ".gif"
+    data = {
+        "course": "Computer Science",
+        "school": "University of Awesome",
+        "start_date": "2020",
+        "end_date": "2024",
+        "grade": "A",
+        "logo": (io.BytesIO(logo), "large-logo.gif"),
+    }
+    try:
+        response = client.post(
+            "/resume/education", data=data, content_type="multipart/form-data"
+        )
+        assert response.status_code == 201
+        assert os.path.exists(os.path.join("uploads", saved_name))
+        assert not os.listdir(os.path.join("uploads", ".tmp"))
+    finally:
+        os.remove(os.path.join("uploads", saved_name))
+    assert client.get("/uploads/.tmp/.upload-example").status_code == 404
+
+
+def test_small_upload_is_moved_into_place(tmp_path, monkeypatch):
+    """In-memory uploads reach the destination whole or not at all."""
+    destination = tmp_path / "logo.png"
+    with app.app_context():
+        save_upload(FileStorage(io.BytesIO(b"logo")), str(destination))
+        assert destination.read_bytes() == b"logo"
+        destination.unlink()
+
+        def fail(*args, **kwargs):
+            raise OSError("No space left on device")
+
+        monkeypatch.setattr(shutil, "copyfileobj", fail)
+        with pytest.raises(OSError):
+            save_upload(FileStorage(io.BytesIO(b"logo")), str(destination))
+    assert not destination.exists()
+    assert not os.listdir(os.path.join("uploads", ".tmp"))
+
+
 def test_put_education_with_file_upload(client):
     """Test the PUT request for updating education with file upload."""
     example_education = {
@@ -222,6 +326,24 @@ def test_skill(client):
     assert response.json[item_id] == example_skill
 
 
+def test_post_skill_with_form_data(client):
+    """Skills can be created from multipart form data."""
+    response = client.post(
+        "/resume/skill",
+        data={"name": "Rust", "proficiency": "1 year"},
+        content_type="multipart/form-data",
+    )
+    assert response.status_code == 201
+    skill = client.get("/resume/skill").json[response.json["id"]]
+    assert skill["name"] == "Rust"
+
+
+def test_post_skill_without_body(client):
+    """A skill request without a JSON or form body is rejected."""
+    response = client.post("/resume/skill", data="name=Rust", content_type="text/plain")
+    assert response.status_code == 400
+
+
 def test_delete_skill(client):
     """Test the skill deletion endpoint: remove all existing skills, add one, remove it, and attempt to remove it again."""
 
@@ -260,6 +382,18 @@ def test_post_user_information(client):
     assert response.json["phone_number"] == new_user_info["phone_number"]
 
 
+def test_post_user_information_without_json(client):
+    """User information requests without a JSON body report the required fields."""
+    response = client.post("/resume/user_information", data="name=John Doe")
+    assert response.status_code == 400
+    assert response.json["error"] == (
+        "name, email_address, phone_number parameter(s) is required"
+    )
+
+    response = client.post("/resume/user_information", json=["John Doe"])
+    assert response.status_code == 400
+
+
 def test_spellcheck(client):
     """Test the spell check endpoint."""
     data["experience"].append(
@@ -306,6 +440,8 @@ def test_spellcheck(client):
     assert any(r["after"] != "Comptuer Science" for r in results)
     assert any(r["before"] == "Pythn" for r in results)
     assert any(r["after"] != "Pythn" for r in results)
+    assert {"before": "Writting Python Code", "after": ["Writing Python Code"]} in results
+    assert {"before": "Pythn", "after": ["Python"]} in results
 
 
 def test_validate_fields_all_present():
@@ -329,6 +465,200 @@ def test_validate_fields_missing_field():
     assert result == ["phone_number"]
 
 
+def test_section_validators():
+    """Missing and wrongly typed fields are reported separately."""
+    request_body = {"name": "Python", "proficiency": 3}
+    assert validate_skill(request_body) == ([], ["proficiency"])
+    assert validate_skill({"proficiency": "Expert"}) == (["name"], [])
+    assert validate_skill({"name": "Python", "proficiency": "Expert"}) == ([], [])
+
+    request_body = {"title": "Developer", "company": 1, "end_date": "2024"}
+    missing, invalid = validate_experience(request_body)
+    assert missing == ["start_date", "description"]
+    assert invalid == ["company"]
+
+
+def test_allowed_file():
+    """Only image extensions are accepted, regardless of case."""
+    assert allowed_file("logo.png")
+    assert allowed_file("LOGO.JPEG")
+    assert allowed_file("Company Logo.Gif")
+    assert not allowed_file("logo.png.exe")
+    assert not allowed_file("png")
+
+
+def test_allowed_extension():
+    """The lowercased extension is returned only for allowed files."""
+    assert allowed_extension("Company.Logo.JPG") == "jpg"
+    assert allowed_extension("logo.png.exe") is None
+    assert allowed_extension("gif") is None
+
+
+def test_has_image_signature():
+    """Files are recognised as images by their leading bytes."""
+    png = io.BytesIO(b"\x89PNG\r\n\x1a\n" + b"data")
+    assert has_image_signature(png)
+    assert png.tell() == 0
+    assert has_image_signature(io.BytesIO(b"GIF89a"))
+    assert not has_image_signature(io.BytesIO(b"MZ\x90\x00 renamed exe"))
+
+
+def test_upload_rejects_non_image_logo(client):
+    """A logo whose content is not an image falls back to the default logo."""
+    data = {
+        "course": "Computer Science",
+        "school": "University of Awesome",
+        "start_date": "2020",
+        "end_date": "2024",
+        "grade": "A",
+        "logo": (io.BytesIO(b"MZ\x90\x00 renamed exe"), "evil.png"),
+    }
+    response = client.post(
+        "/resume/education", data=data, content_type="multipart/form-data"
+    )
+    assert response.status_code == 201
+    education = client.get("/resume/education").json[response.json["id"]]
+    assert education["logo"] == "default.jpg"
+    assert not os.path.exists(os.path.join("uploads", "evil.png"))
+
+
+def test_file_sha256():
+    """The digest matches hashlib and the stream is rewound."""
+    stream = io.BytesIO(b"logo bytes")
+    assert file_sha256(stream) == hashlib.sha256(b"logo bytes").digest()
+    assert stream.tell() == 0
+
+
+def test_duplicate_logo_reuses_saved_file(client):
+    """Uploading the same logo content twice stores it only once."""
+    logo = b"GIF89a identical logo"
+    first = {
+        "course": "Computer Science",
+        "school": "University of Awesome",
+        "start_date": "2020",
+        "end_date": "2024",
+        "grade": "A",
+        "logo": (io.BytesIO(logo), "school-logo.gif"),
+    }
+    second = dict(first, logo=(io.BytesIO(logo), "same-logo.gif"))
+    saved_name = hashlib.sha256(logo).hexdigest() + ".gif"
+    try:
+        first_id = client.post(
+            "/resume/education", data=first, content_type="multipart/form-data"
+        ).json["id"]
+        second_id = client.post(
+            "/resume/education", data=second, content_type="multipart/form-data"
+        ).json["id"]
+        entries = client.get("/resume/education").json
+        assert entries[first_id]["logo"] == saved_name
+        assert entries[second_id]["logo"] == saved_name
+        assert not os.path.exists(os.path.join("uploads", "school-logo.gif"))
+        assert not os.path.exists(os.path.join("uploads", "same-logo.gif"))
+    finally:
+        os.remove(os.path.join("uploads", saved_name))
+
+
+def test_spellcheck_correct_field(client):
+    """A field without misspelled words has no corrections."""
+    request_body = {"skill": [{"name": "Python"}]}
+    response = client.post("/resume/spellcheck", json=request_body)
+    assert response.json == [{"before": "Python", "after": []}]
+
+
+def test_spellcheck_keeps_acronyms(client):
+    """Words that are not lowercase or capitalized are left as written."""
+    request_body = {"skill": [{"name": "NASA iOS Pythn"}]}
+    response = client.post("/resume/spellcheck", json=request_body)
+    assert response.json == [{"before": "NASA iOS Pythn", "after": ["NASA iOS Python"]}]
+
+
+def test_spellcheck_without_json(client):
+    """A spellcheck request without a JSON body is rejected with a 400."""
+    response = client.post("/resume/spellcheck", data="not json")
+    assert response.status_code == 400
+    assert response.json["error"] == "Request must be JSON"
+
+
+def test_spellcheck_invalid_entries(client):
+    """Non-object bodies get a 400; entries and fields of other types are skipped."""
+    for body in ([1], "abc", 5):
+        response = client.post("/resume/spellcheck", json=body)
+        assert response.status_code == 400
+        assert response.json["error"] == "Request must be JSON"
+
+    request_body = {
+        "experience": "not a list",
+        "education": [None, "course"],
+        "skill": [{"name": 5}, {"name": ["Python"]}, {"name": "Python"}],
+    }
+    response = client.post("/resume/spellcheck", json=request_body)
+    assert response.status_code == 200
+    assert response.json == [{"before": "Python", "after": []}]
+
+
+def test_changes_are_saved_on_flush(client):
+    """Pending changes are written to data.json by flush_data."""
+    skill = {"name": "Rust", "proficiency": "1 Year"}
+    client.post("/resume/skill", json=skill)
+    flush_data()
+    saved_skills = [asdict(s) for s in load_data("data/data.json")["skill"]]
+    assert dict(skill, logo="default.jpg") in saved_skills
+
+
+def test_section_etag(client):
+    """Section listings carry an ETag that changes with the section."""
+    response = client.get("/resume/skill")
+    etag = response.headers["ETag"]
+
+    cached = client.get("/resume/skill", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.data == b""
+
+    client.post("/resume/skill", json={"name": "Go", "proficiency": "1 Year"})
+    changed = client.get("/resume/skill", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_uploads_accel_redirect(client, monkeypatch):
+    """With UPLOADS_ACCEL_REDIRECT set, nginx is told to send the file."""
+    monkeypatch.setitem(app.config, "UPLOADS_ACCEL_REDIRECT", "/internal-uploads/")
+    response = client.get("/uploads/default.jpg")
+    assert response.status_code == 200
+    assert response.headers["X-Accel-Redirect"] == "/internal-uploads/default.jpg"
+    assert response.mimetype == "image/jpeg"
+    assert response.data == b""
+    assert client.get("/uploads/missing.png").status_code == 404
+    assert client.get("/uploads/../app.py").status_code == 404
+
+
+def test_custom_sections(client):
+    """Added custom sections are listed by /custom-sections."""
+    section = {"title": "Awards", "content": "Hackathon winner"}
+    response = client.post("/custom-section", json=section)
+    assert response.status_code == 201
+
+    sections = client.get("/custom-sections").json
+    assert sections[response.json["id"]] == section
+
+
+def test_custom_section_non_object_body(client):
+    """Custom sections sent as a JSON array or scalar are rejected with a 400."""
+    for body in ([{"title": "Awards", "content": "Hackathon"}], "abc", 5):
+        response = client.post("/custom-section", json=body)
+        assert response.status_code == 400
+        assert response.json["error"] == "Request must be JSON"
+
+
+def test_non_object_json_body(client):
+    """JSON bodies that are not objects are rejected with a 400."""
+    for url in ("/resume/experience", "/resume/education", "/resume/skill"):
+        for body in ([1], "abc", 5):
+            response = client.post(url, json=body)
+            assert response.status_code == 400
+    assert client.put("/resume/education/0", json=[1]).status_code == 400
+
+
 def test_valid_phone_number():
     """Test a valid properly internationalized phone number returns True."""
     valid_phone = "+14155552671"
@@ -341,6 +671,23 @@ def test_invalid_phone_number():
     assert validate_phone_number(invalid_phone) is False
 
 
+def test_non_string_phone_number():
+    """Test a phone number that is not a string returns False."""
+    assert validate_phone_number(14155552671) is False
+    assert validate_phone_number(["+14155552671"]) is False
+
+
+def test_formatted_phone_number():
+    """Test formatted, extension and vanity numbers are accepted."""
+    assert validate_phone_number("+1 (415) 555-2671") is True
+    assert validate_phone_number("+49 (0) 30 - 1234 - 5678 - 90") is True
+    assert validate_phone_number("+1 415 555 2671 ext. 12") is True
+    assert validate_phone_number("+1 415 555 2671 x12") is True
+    assert validate_phone_number("+1-800-FLOWERS") is True
+    assert validate_phone_number("+1 415 555 2671; DROP TABLE") is False
+    assert validate_phone_number("+1" + "5" * 300) is False
+
+
 def test_load_data(tmpdir):
     # Create a temporary file path
     filename = tmpdir.join("data.json")
@@ -387,10 +734,9 @@ def test_load_data(tmpdir):
     assert loaded_data["user_information"][0].name == "John Doe"
 
 
-def test_save_data(tmpdir):
-    # Create a temporary file path
-    filename = tmpdir.join("data.json")
-
+def test_save_encoded_sections(tmpdir):
+    """Encoded sections are written as one JSON object that loads back."""
+    filename = str(tmpdir.join("data.json"))
     data = {
         "experience": [
             Experience(
@@ -405,15 +751,54 @@ def test_save_data(tmpdir):
             UserInformation("John Doe", "john@example.com", "+123456789")
         ],
     }
+    save_encoded_sections(
+        filename,
+        {section: app.json.dumps(entries).encode() for section, entries in data.items()},
+    )
+    assert load_data(filename) == data
 
-    save_data(str(filename), data)
-
-    with open(filename, "r") as file:
-        saved_data = json.load(file)
 
-    # Assert that the file contains the correct data
-    assert saved_data["experience"][0]["title"] == "Developer"
-    assert saved_data["user_information"][0]["name"] == "John Doe"
+def test_orjson_provider_serializes_models():
+    """Models are encoded by the app's JSON provider without conversion to dicts."""
+    experience = Experience(
+        "Developer", "Company A", "2021", "2022", "Development", "logo.png", 1
+    )
+    assert json.loads(app.json.dumps([experience])) == [
+        {
+            "title": "Developer",
+            "company": "Company A",
+            "start_date": "2021",
+            "end_date": "2022",
+            "description": "Development",
+            "logo": "logo.png",
+            "id": 1,
+        }
+    ]
+    assert app.json.loads(b'{"name": "Python"}') == {"name": "Python"}
+
+def test_models_are_slotted():
+    """Models are slotted dataclasses without a per-instance __dict__."""
+    skill = Skill("Python", "Expert", "logo.png")
+    assert not hasattr(skill, "__dict__")
+    assert asdict(skill) == {"name": "Python", "proficiency": "Expert", "logo": "logo.png"}
+
+
+def test_generate_id():
+    """IDs continue after the highest ID and start at 1 for empty sections."""
+    entries = [
+        Experience("Developer", "Company A", "2021", "2022", "Development", "logo.png", 1),
+        Experience("Developer", "Company B", "2022", "2023", "Development", "logo.png", 4),
+    ]
+    assert generate_id({"experience": entries}, "experience") == 5
+    entries.append(
+        Experience("Developer", "Company C", "2023", "2024", "Development", "logo.png")
+    )
+    assert generate_id({"experience": entries}, "experience") == 5
+    assert generate_id({"experience": []}, "experience") == 1
+    entries.append(
+        Experience("Developer", "Company D", "2024", "2025", "Development", "logo.png", 2)
+    )
+    assert generate_id({"experience": entries}, "experience") == 5
 
 def test_reset_endpoint(client):
     """
@@ -421,4 +806,20 @@ def test_reset_endpoint(client):
     """
     response = client.post("/reset")
     assert response.status_code == 200
-    assert response.json["message"] == "Data has been reset"
\ No newline at end of file
+    assert response.json["message"] == "Data has been reset"
+
+def test_reset_keeps_sections_cached(client):
+    """A reset replaces the cached encodings instead of clearing them."""
+    client.post("/custom-section", json={"title": "Awards", "content": "Hackathon"})
+    client.get("/resume/skill")
+    client.get("/custom-sections")
+    client.post("/reset")
+    for section in ("experience", "education", "skill", "user_information", "custom_sections"):
+        assert _response_cache[section] == b"[]"
+    assert client.get("/resume/skill").json == []
+    assert client.get("/custom-sections").json == []
+
+
+def test_import_leaves_logging_alone():
+    """Importing the app does not attach its queue handler to the root logger."""
+    assert log_handler not in logging.getLogger().handlers
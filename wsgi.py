@@ -0,0 +1,9 @@
+"""
+WSGI entry point for running the app under a production server such as gunicorn
+"""
+
+from app import app, configure_logging
+
+configure_logging()
+
+__all__ = ["app"]